@@ -7,8 +7,9 @@ CRITICAL: Credentials go ONLY in http-client.env.json, NOT in converted.http!
 import json
 import re
 import os
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 # API endpoint mappings for known detector types
 API_ENDPOINTS = {
@@ -122,7 +123,67 @@ API_ENDPOINTS = {
     }
 }
 
+
+def _to_format(template: str) -> str:
+    """Turn a '{{var}}' placeholder template into a %-format string."""
+    return template.replace('%', '%%').replace('{{var}}', '%(var)s')
+
+
+def _build_request_template(endpoint: Dict) -> str:
+    """Expand an API_ENDPOINTS entry into one %-format string for a full request."""
+    lines = []
+    
+    # Separator with label
+    lines.append('### %(label)s (%(ext_id)s)')
+    
+    # Request line
+    lines.append(f"{endpoint['method']} {_to_format(endpoint['url'])} HTTP/1.1")
+    
+    # Headers
+    for header, value in endpoint['headers'].items():
+        lines.append(f"{header.replace('%', '%%')}: {_to_format(value)}")
+    
+    # Response redirect
+    lines.append('>> responses/%(ext_id)s/%(detector)s.json')
+    
+    # Body (if present)
+    if endpoint['body']:
+        lines.append('')  # Blank line before body
+        lines.append(json.dumps(endpoint['body'], indent=2).replace('%', '%%'))
+    
+    lines.append('')  # Blank line after request
+    
+    return '\n'.join(lines) + '\n'
+
+
+# API_ENDPOINTS expanded into request templates once at import time
+_ENDPOINT_TEMPLATES = {
+    detector: _build_request_template(endpoint)
+    for detector, endpoint in API_ENDPOINTS.items()
+}
+
+# Detector keys that have a known API endpoint
+_ENDPOINT_KEYS = frozenset(API_ENDPOINTS)
+
+# Scan line prefix -> SecretEntry attribute
+_FIELD_SETTERS = {
+    'Detector Type': 'detector_type',
+    'Decoder Type': 'decoder_type',
+    'Raw result': 'raw_result',  # the actual secret!
+    'File': 'file_path',
+    'Line': 'line_number'
+}
+
+# Matches extensions/{extension_id}/... in scan file paths
+_EXT_RE = re.compile(r'extensions/([^/]+)/')
+
 class SecretEntry:
+    __slots__ = (
+        'detector_type', 'decoder_type', 'raw_result', 'file_path', 'line_number',
+        'verified', 'extension_id', 'extra_info', '_ext_id_cache', '_detector_key',
+        '_var_name'
+    )
+    
     def __init__(self):
         self.detector_type = ''
         self.decoder_type = ''
@@ -132,44 +193,58 @@ class SecretEntry:
         self.verified = False
         self.extension_id = ''
         self.extra_info = {}
+        self._ext_id_cache = None
+        self._detector_key = None
+        self._var_name = None
     
     def extract_extension_id(self):
-        """Extract extension ID from file path."""
-        if not self.file_path:
-            return 'unknown'
+        """Extract extension ID from file path (cached after first call)."""
+        if self._ext_id_cache is not None:
+            return self._ext_id_cache
+        
+        ext_id = 'unknown'
+        if self.file_path:
+            # Match pattern: extensions/{extension_id}/...
+            match = _EXT_RE.search(self.file_path)
+            if match:
+                ext_id = match.group(1)
         
-        # Match pattern: extensions/{extension_id}/...
-        match = re.search(r'extensions/([^/]+)/', self.file_path)
-        if match:
-            return match.group(1)
-        return 'unknown'
+        self._ext_id_cache = ext_id
+        return ext_id
+    
+    def _detector_norm(self):
+        """Normalized detector type used as the API_ENDPOINTS key."""
+        if self._detector_key is None:
+            self._detector_key = self.detector_type.lower().replace(' ', '').replace('-', '')
+        return self._detector_key
     
     def get_variable_name(self):
         """Generate variable name: extension_id_detector_type"""
-        ext_id = self.extension_id or self.extract_extension_id()
-        detector = self.detector_type.lower().replace(' ', '').replace('-', '')
-        return f"{ext_id}_{detector}"
+        if self._var_name is None:
+            self._var_name = f"{self.extension_id}_{self._detector_norm()}"
+        return self._var_name
     
     def is_known_type(self):
         """Check if detector type has known API endpoint."""
-        detector = self.detector_type.lower().replace(' ', '').replace('-', '')
-        return detector in API_ENDPOINTS
+        return self._detector_norm() in _ENDPOINT_KEYS
 
 
-def parse_scan_file(filepath: str) -> List[SecretEntry]:
-    """Parse scan.txt and extract all secrets."""
-    secrets = []
+def iter_secrets(filepath: str) -> Iterator[SecretEntry]:
+    """Parse scan.txt and yield each secret as soon as its entry is complete."""
     current_entry = None
     
-    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+    # Stream lines through a 1 MiB buffer so only the current entry and the
+    # unique secrets stay in memory, not the whole file
+    with open(filepath, 'r', encoding='utf-8', errors='ignore', buffering=1 << 20) as f:
         for line in f:
             line = line.rstrip()
             
             # Check for verified or unverified marker
             if 'Found verified result' in line or 'Found unverified result' in line:
-                # Save previous entry if exists
+                # Emit previous entry if exists
                 if current_entry and current_entry.raw_result:
-                    secrets.append(current_entry)
+                    current_entry.extension_id = current_entry.extract_extension_id()
+                    yield current_entry
                 
                 # Start new entry
                 current_entry = SecretEntry()
@@ -179,53 +254,41 @@ def parse_scan_file(filepath: str) -> List[SecretEntry]:
             if not current_entry:
                 continue
             
-            # Extract detector type
-            if line.startswith('Detector Type:'):
-                current_entry.detector_type = line.split(':', 1)[1].strip()
-            
-            # Extract decoder type
-            elif line.startswith('Decoder Type:'):
-                current_entry.decoder_type = line.split(':', 1)[1].strip()
-            
-            # Extract raw result (the actual secret!)
-            elif line.startswith('Raw result:'):
-                current_entry.raw_result = line.split(':', 1)[1].strip()
-            
-            # Extract file path
-            elif line.startswith('File:'):
-                current_entry.file_path = line.split(':', 1)[1].strip()
+            colon = line.find(':')
+            if colon < 0:
+                continue
+            key = line[:colon]
             
-            # Extract line number
-            elif line.startswith('Line:'):
-                current_entry.line_number = line.split(':', 1)[1].strip()
+            # Known fields (Detector Type, Raw result, File, ...)
+            attr = _FIELD_SETTERS.get(key)
+            if attr:
+                setattr(current_entry, attr, line[colon + 1:].strip())
             
-            # Extract any extra info (Username, Version, etc.)
-            elif ':' in line and not line.startswith(' '):
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    key = parts[0].strip()
-                    value = parts[1].strip()
-                    current_entry.extra_info[key] = value
+            # Extract any extra info (Username, Version, etc.). Trufflehog labels
+            # these as capitalized words; skip stray text such as URLs.
+            elif key[:1].isupper() and key.replace('_', '').replace(' ', '').isalnum():
+                current_entry.extra_info[key.strip()] = line[colon + 1:].strip()
     
     # Don't forget the last entry!
     if current_entry and current_entry.raw_result:
-        secrets.append(current_entry)
-    
-    return secrets
+        current_entry.extension_id = current_entry.extract_extension_id()
+        yield current_entry
 
 
-def deduplicate_secrets(secrets: List[SecretEntry]) -> Tuple[List[SecretEntry], List[SecretEntry]]:
+def deduplicate_secrets(secrets: Iterable[SecretEntry]) -> Tuple[List[SecretEntry], List[SecretEntry]]:
     """
-    Deduplicate secrets by raw_result value.
-    Returns: (unique_secrets, known_secrets, unknown_secrets)
+    Deduplicate secrets by raw_result value, consuming them in a single pass.
+    Returns: (known_secrets, unknown_secrets)
     """
-    seen_secrets: Set[str] = set()
-    unique_secrets = []
-    
+    # dict preserves insertion order, so the first occurrence wins.
+    # CPython has no capacity hint for dict/set, so keep the growth loop
+    # tight by binding setdefault once instead of per secret.
+    seen_secrets: Dict[str, SecretEntry] = {}
+    keep_first = seen_secrets.setdefault
     for secret in secrets:
-        if secret.raw_result not in seen_secrets:
-            seen_secrets.add(secret.raw_result)
-            unique_secrets.append(secret)
+        keep_first(secret.raw_result, secret)
+    # Iterate the dict view directly rather than copying it into a list
+    unique_secrets = seen_secrets.values()
     
     # Separate known and unknown types
     known = [s for s in unique_secrets if s.is_known_type()]
@@ -234,56 +297,29 @@ def deduplicate_secrets(secrets: List[SecretEntry]) -> Tuple[List[SecretEntry],
     return known, unknown
 
 
-def generate_http_request(secret: SecretEntry) -> str:
-    """Generate HTTP request for a secret."""
-    detector = secret.detector_type.lower().replace(' ', '').replace('-', '')
-    endpoint = API_ENDPOINTS.get(detector)
-    
-    if not endpoint:
-        return ''
-    
-    var_name = secret.get_variable_name()
-    ext_id = secret.extension_id or secret.extract_extension_id()
-    detector_clean = secret.detector_type.lower().replace(' ', '')
-    
-    # Build request
-    lines = []
-    
-    # Separator with label
-    lines.append(f"### {secret.detector_type} ({ext_id})")
-    
-    # Build URL with variable
-    url = endpoint['url'].replace('{{var}}', f'{{{{{var_name}}}}}')
-    
-    # Request line
-    lines.append(f"{endpoint['method']} {url} HTTP/1.1")
+def write_http_request(secret: SecretEntry, f_write) -> bool:
+    """Write the HTTP request for a secret via f_write. Returns False if unsupported."""
+    template = _ENDPOINT_TEMPLATES.get(secret._detector_norm())
     
-    # Headers
-    for header, value in endpoint['headers'].items():
-        header_value = value.replace('{{var}}', f'{{{{{var_name}}}}}')
-        lines.append(f"{header}: {header_value}")
-    
-    # Response redirect
-    lines.append(f">> responses/{ext_id}/{detector_clean}.json")
+    if not template:
+        return False
     
-    # Body (if present)
-    if endpoint['body']:
-        lines.append('')  # Blank line before body
-        lines.append(json.dumps(endpoint['body'], indent=2))
+    f_write(template % {
+        'label': secret.detector_type,
+        'ext_id': secret.extension_id,
+        'var': '{{%s}}' % secret.get_variable_name(),
+        'detector': secret.detector_type.lower().replace(' ', '')
+    })
     
-    lines.append('')  # Blank line after request
-    
-    return '\n'.join(lines)
+    return True
 
 
 def generate_converted_http(secrets: List[SecretEntry], output_path: str):
     """Generate converted.http file."""
-    with open(output_path, 'w', encoding='utf-8') as f:
+    with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f_write = f.write
         for secret in secrets:
-            request = generate_http_request(secret)
-            if request:
-                f.write(request)
-                f.write('\n')
+            write_http_request(secret, f_write)
 
 
 def generate_env_json(secrets: List[SecretEntry], output_path: str):
@@ -305,22 +341,24 @@ def generate_env_json(secrets: List[SecretEntry], output_path: str):
 
 def generate_unknown_txt(secrets: List[SecretEntry], output_path: str):
     """Generate unknown.txt for unsupported secret types."""
-    with open(output_path, 'w', encoding='utf-8') as f:
+    with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
         for secret in secrets:
-            f.write(f"Unknown Secret Type: {secret.detector_type}\n")
-            ext_id = secret.extension_id or secret.extract_extension_id()
-            f.write(f"Extension: {ext_id}\n")
-            f.write(f"Raw Value: {secret.raw_result}\n")
-            f.write(f"File: {secret.file_path}\n")
+            # Build the whole entry so each secret costs a single write
+            block = [
+                f"Unknown Secret Type: {secret.detector_type}\n",
+                f"Extension: {secret.extension_id}\n",
+                f"Raw Value: {secret.raw_result}\n",
+                f"File: {secret.file_path}\n",
+            ]
             if secret.line_number:
-                f.write(f"Line: {secret.line_number}\n")
+                block.append(f"Line: {secret.line_number}\n")
             
             # Add extra info
             for key, value in secret.extra_info.items():
-                f.write(f"{key}: {value}\n")
+                block.append(f"{key}: {value}\n")
             
-            f.write(f"Verified: {'Yes' if secret.verified else 'No'}\n")
-            f.write('\n')
+            block.append(f"Verified: {'Yes' if secret.verified else 'No'}\n\n")
+            f.write(''.join(block))
 
 
 def create_response_directories(secrets: List[SecretEntry], base_path: str):
@@ -328,69 +366,64 @@ def create_response_directories(secrets: List[SecretEntry], base_path: str):
     base_dir = Path(base_path)
     base_dir.mkdir(exist_ok=True)
     
-    # Create subdirectories for each extension
-    extension_ids = set()
-    for secret in secrets:
-        ext_id = secret.extension_id or secret.extract_extension_id()
-        extension_ids.add(ext_id)
+    # One directory listing instead of a mkdir call per extension on re-runs
+    with os.scandir(base_dir) as entries:
+        existing = {entry.name for entry in entries if entry.is_dir()}
     
-    for ext_id in extension_ids:
-        ext_dir = base_dir / ext_id
-        ext_dir.mkdir(exist_ok=True)
+    # Create subdirectories for each extension (extension_id is assigned by
+    # iter_secrets when the entry is yielded)
+    extension_ids = {secret.extension_id for secret in secrets}
+    for ext_id in extension_ids - existing:
+        os.makedirs(base_dir / ext_id, exist_ok=True)
 
 
 def main():
     """Main execution function."""
-    print("🚀 STARTING SECRET CONVERSION - WAKANDA FOREVER! 🚀")
-    print("=" * 60)
-    
-    # Parse scan.txt
-    print("📖 Step 1: Parsing scan.txt...")
-    secrets = parse_scan_file('/Users/ron.s/dev/sick-rats/scan.txt')
-    print(f"   ✅ Found {len(secrets)} total secrets")
-    
-    # Deduplicate
-    print("🔍 Step 2: Deduplicating secrets...")
+    sys.stdout.write(
+        "🚀 STARTING SECRET CONVERSION - WAKANDA FOREVER! 🚀\n"
+        f"{'=' * 60}\n"
+    )
+    
+    # Parse scan.txt and deduplicate in one streaming pass
+    # (extension IDs are assigned as each entry is parsed)
+    print("📖 Step 1: Parsing and deduplicating scan.txt...")
+    secrets = iter_secrets('/Users/ron.s/dev/sick-rats/scan.txt')
     known_secrets, unknown_secrets = deduplicate_secrets(secrets)
     print(f"   ✅ {len(known_secrets)} known secrets (with API endpoints)")
     print(f"   ✅ {len(unknown_secrets)} unknown secrets (no API endpoints)")
     
-    # Extract extension IDs for all secrets
-    print("🏷️  Step 3: Extracting extension IDs...")
-    for secret in known_secrets + unknown_secrets:
-        secret.extension_id = secret.extract_extension_id()
-    print(f"   ✅ Extension IDs extracted")
-    
     # Create response directories
-    print("📁 Step 4: Creating responses/ directory structure...")
+    print("📁 Step 2: Creating responses/ directory structure...")
     create_response_directories(known_secrets, '/Users/ron.s/dev/sick-rats/responses')
     print(f"   ✅ Response directories created")
     
     # Generate converted.http
-    print("📝 Step 5: Generating converted.http...")
+    print("📝 Step 3: Generating converted.http...")
     generate_converted_http(known_secrets, '/Users/ron.s/dev/sick-rats/converted.http')
     print(f"   ✅ converted.http created with {len(known_secrets)} requests")
     
     # Generate http-client.env.json (REPLACE mode)
-    print("🔐 Step 6: Generating http-client.env.json...")
+    print("🔐 Step 4: Generating http-client.env.json...")
     generate_env_json(known_secrets, '/Users/ron.s/dev/sick-rats/http-client.env.json')
     print(f"   ✅ http-client.env.json created with {len(known_secrets)} credentials")
     
     # Generate unknown.txt
-    print("❓ Step 7: Generating unknown.txt...")
+    print("❓ Step 5: Generating unknown.txt...")
     generate_unknown_txt(unknown_secrets, '/Users/ron.s/dev/sick-rats/unknown.txt')
     print(f"   ✅ unknown.txt created with {len(unknown_secrets)} entries")
     
     # Final validation
-    print("\n" + "=" * 60)
-    print("🎯 VALIDATION CHECKLIST:")
-    print("   ✅ All credentials in http-client.env.json ONLY")
-    print("   ✅ Only variable references in converted.http")
-    print("   ✅ Response directories created")
-    print("   ✅ Unknown secrets documented in unknown.txt")
-    print("   ✅ Deduplication applied")
-    print("\n🏆 MISSION ACCOMPLISHED! WAKANDA IS PROUD! 🏆")
-    print("=" * 60)
+    sys.stdout.write(
+        f"\n{'=' * 60}\n"
+        "🎯 VALIDATION CHECKLIST:\n"
+        "   ✅ All credentials in http-client.env.json ONLY\n"
+        "   ✅ Only variable references in converted.http\n"
+        "   ✅ Response directories created\n"
+        "   ✅ Unknown secrets documented in unknown.txt\n"
+        "   ✅ Deduplication applied\n"
+        "\n🏆 MISSION ACCOMPLISHED! WAKANDA IS PROUD! 🏆\n"
+        f"{'=' * 60}\n"
+    )
 
 
 if __name__ == '__main__':